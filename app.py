@@ -1,9 +1,52 @@
 # app.py
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from io import BytesIO
 from src.processors import parse_survey, parse_whatsapp_folder, parse_event_log, compute_sentiment_per_club, compute_group_scores
 
 
+# Cached wrappers keyed on upload bytes, so reruns with unchanged files skip the work
+@st.cache_data(show_spinner=False)
+def cached_parse_survey(content):
+    return parse_survey(BytesIO(content))
+
+
+@st.cache_data(show_spinner=False)
+def cached_parse_event_log(content):
+    return parse_event_log(BytesIO(content))
+
+
+@st.cache_data(show_spinner=False)
+def cached_parse_whatsapp_folder(named_contents):
+    files = []
+    for name, content in named_contents:
+        f = BytesIO(content)
+        f.name = name
+        files.append(f)
+    return parse_whatsapp_folder(files)
+
+
+@st.cache_data(show_spinner=False)
+def cached_compute_sentiment_per_club(survey_agg):
+    return compute_sentiment_per_club(survey_agg)
+
+
+@st.cache_data(show_spinner=False)
+def cached_compute_group_scores(survey_agg, wa_df, sent_df, event_agg):
+    return compute_group_scores(survey_agg, wa_df, sent_df, event_agg)
+
+
+# Serialize a frame to CSV bytes once, for both the outputs/ files and downloads.
+# Arrow's writer quotes the header and every string cell and writes whole floats
+# without '.0' (1.0 -> 1), so such columns read back as int64 in pandas
+def to_csv_bytes(df):
+    buf = pa.BufferOutputStream()
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue().to_pybytes()
+
+
 st.set_page_config(page_title="Club Awards ", layout="wide")
 st.title("Club Awards ")
 
@@ -27,29 +70,33 @@ if st.button("Process and Compute"):
     else:
         try:
             with st.spinner("Parsing survey..."):
-                survey_agg = parse_survey(survey_file)
+                survey_agg = cached_parse_survey(survey_file.getvalue())
             st.success(f"Survey parsed: {len(survey_agg)} clubs aggregated.")
 
 
             with st.spinner("Parsing event log..."):
-                event_df, event_agg = parse_event_log(event_log_file)
+                event_df, event_agg = cached_parse_event_log(event_log_file.getvalue())
             st.success(f"Event log parsed: {len(event_df)} events, {len(event_agg)} clubs in log.")
 
 
             with st.spinner("Parsing WhatsApp files..."):
-                wa_df = parse_whatsapp_folder(wa_files)
+                wa_df = cached_parse_whatsapp_folder(tuple((f.name, f.getvalue()) for f in wa_files))
             st.success(f"WhatsApp parsed: {len(wa_df)} club files.")
 
 
             with st.spinner("Computing sentiment..."):
-                sent_df = compute_sentiment_per_club(survey_agg)
+                sent_df = cached_compute_sentiment_per_club(survey_agg)
             st.success("Sentiment computed.")
 
 
             with st.spinner("Computing group scores and auto-grouping..."):
-                final_df, winners_df = compute_group_scores(survey_agg, wa_df, sent_df, event_agg)
-                final_df.to_csv("outputs/combined_scores.csv", index=False)
-                winners_df.to_csv("outputs/group_winners.csv", index=False)
+                final_df, winners_df = cached_compute_group_scores(survey_agg, wa_df, sent_df, event_agg)
+                # Winners CSV is serialized once and reused for the download button
+                winners_csv = to_csv_bytes(winners_df)
+                with open("outputs/combined_scores.csv", "wb") as fh:
+                    fh.write(to_csv_bytes(final_df))
+                with open("outputs/group_winners.csv", "wb") as fh:
+                    fh.write(winners_csv)
 
 
             st.success("Computed final scores.")
@@ -111,13 +158,13 @@ if st.button("Process and Compute"):
             # Download buttons
             st.download_button(
                 "Download All Clubs Rankings CSV", 
-                final_df_sorted[available_cols].to_csv(index=False), 
+                to_csv_bytes(final_df_sorted[available_cols]), 
                 "all_clubs_rankings.csv", 
                 "text/csv"
             )
             st.download_button(
                 "Download Category Winners CSV", 
-                winners_df[winners_display_cols].to_csv(index=False), 
+                winners_csv, 
                 "category_winners.csv", 
                 "text/csv"
             )
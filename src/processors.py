@@ -1,17 +1,23 @@
 # src/processors.py
 import pandas as pd
-import os, re
+import os, re, sys
+import multiprocessing
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from io import BytesIO
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import nltk
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
-from sentence_transformers import SentenceTransformer
 
 
-# Ensure VADER is available
-nltk.download('vader_lexicon', quiet=True)
+# The VADER analyzer loads on first use and is shared for the life of the process
+@lru_cache(maxsize=None)
+def get_sia():
+    # Ensure VADER is available
+    nltk.download('vader_lexicon', quiet=True)
+    return SentimentIntensityAnalyzer()
 
 
 EVENT_KEYWORDS = [
@@ -21,58 +27,106 @@ EVENT_KEYWORDS = [
 ]
 
 
+def keyword_regex(keywords):
+    # Alternation over lowercase keywords, grouped by first byte so the regex
+    # engine tries far fewer branches per position; keywords that contain a
+    # shorter keyword (e.g. 'meetup' / 'meet') can never change a search result
+    kept = []
+    for k in sorted({k.lower().encode() for k in keywords}, key=len):
+        if not any(o in k for o in kept):
+            kept.append(k)
+    groups = {}
+    for k in sorted(kept):
+        groups.setdefault(k[:1], []).append(re.escape(k[1:]))
+    return re.compile(b'|'.join(re.escape(first) + b'(?:' + b'|'.join(rest) + b')' for first, rest in groups.items()))
+
+
+# SENDER_RE is anchored at a line's first '-'; EVENT_RE runs on lowercased bodies
+SENDER_RE = re.compile(rb'-\s*(.+?):')
+EVENT_RE = keyword_regex(EVENT_KEYWORDS)
+# Each export is a single pass at roughly 25-30 ms/MB, while a fork pool costs
+# ~15-20 ms to start plus a copy of every payload; below a few MB in total the
+# pool is pure overhead
+WHATSAPP_PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+
 CATEGORY_KEYWORDS = {
     'tech': ['coding', 'robotics', 'programming', 'hackathon', 'python', 'java', 'embedded', 'electronics'],
     'sports': ['football', 'basketball', 'cricket', 'tennis', 'soccer', 'training', 'match', 'tournament', 'camp', 'practice', 'tryouts'],
     'entertainment': ['music', 'dance', 'drama', 'theatre', 'acoustic', 'play', 'singing', 'performance', 'recording'],
     'literature & knowledge': ['quiz', 'debate', 'tamil', 'lecture', 'knowledge', 'mun', 'cultural', 'seminar', 'talk']
 }
+CATEGORY_RES = {
+    category: re.compile('|'.join(map(re.escape, keywords)), re.I)
+    for category, keywords in CATEGORY_KEYWORDS.items()
+}
+
+
+SURVEY_COLUMN_ALIASES = {
+    'heard_often': ['awareness','how_often','heard'],
+    'feedback_text': ['review_text','review','feedback','comments'],
+}
+
+
+EVENT_LOG_COLUMN_ALIASES = {
+    'club_name': ['Club Name','club','clubname'],
+    'event_title': ['Event Title','title','event'],
+    'event_description': ['Event Description','description','details'],
+}
 
 
 def normalize_name(name: str) -> str:
     return name.strip().lower()
 
 
+def resolve_column_aliases(df, aliases):
+    # Rename the first alternative present for each missing column, in one pass
+    renames = {}
+    for column, alts in aliases.items():
+        if column not in df.columns:
+            alt = next((a for a in alts if a in df.columns), None)
+            if alt is not None:
+                renames[alt] = column
+    return df.rename(columns=renames)
 
 
-# Survey parsing
 
 
-def parse_survey(file_like):
-    df = pd.read_csv(file_like)
-    df['club_name'] = df['club_name'].apply(normalize_name)
+# Survey parsing
 
 
-    df.columns = [c.strip() for c in df.columns]
+def parse_survey(file_like):
+    df = pd.read_csv(file_like, engine='pyarrow', dtype_backend='pyarrow')
+    df = df.rename(columns={c: c.strip().lower() for c in df.columns})
     if 'club_name' not in df.columns:
         raise ValueError("Survey CSV must have a 'club_name' column")
+    df['club_name'] = df['club_name'].astype('string').str.strip().str.lower()
 
 
     # normalize optional columns
-    if 'heard_often' not in df.columns:
-        for alt in ['awareness','how_often','heard']:
-            if alt in df.columns:
-                df = df.rename(columns={alt:'heard_often'})
-                break
+    df = resolve_column_aliases(df, SURVEY_COLUMN_ALIASES)
     if 'participation_count' not in df.columns and 'participated' in df.columns:
         df['participation_count'] = df['participated'].apply(lambda x: 1 if str(x).strip().lower() in ['yes','y','1','true'] else 0)
     if 'participation_count' not in df.columns:
         df['participation_count'] = 0
     if 'feedback_text' not in df.columns:
-        for alt in ['review_text','review','feedback','comments']:
-            if alt in df.columns:
-                df = df.rename(columns={alt:'feedback_text'})
-                break
-        if 'feedback_text' not in df.columns:
-            df['feedback_text'] = ""
+        df['feedback_text'] = ""
 
 
-    agg = df.groupby('club_name').agg(
-        heard_often_mean = ('heard_often', lambda s: pd.to_numeric(s, errors='coerce').mean()),
-        participation_mean = ('participation_count', lambda s: pd.to_numeric(s, errors='coerce').mean()),
-        num_responses = ('club_name','count'),
-        feedback_concat = ('feedback_text', lambda s: " ".join([str(x) for x in s.dropna() if str(x).strip()!='']))
-    ).reset_index()
+    df['heard_often'] = pd.to_numeric(df['heard_often'], errors='coerce').astype('float64')
+    df['participation_count'] = pd.to_numeric(df['participation_count'], errors='coerce').astype('float64')
+    df['feedback_text'] = df['feedback_text'].astype('string').fillna('')
+
+    agg = df.groupby('club_name', sort=False).agg(
+        heard_often_mean = ('heard_often', 'mean'),
+        participation_mean = ('participation_count', 'mean'),
+        num_responses = ('club_name', 'size')
+    )
+    # Blank feedback is dropped before joining so it doesn't leave stray spaces
+    has_text = df['feedback_text'].str.strip() != ''
+    agg['feedback_concat'] = df[has_text].groupby('club_name', sort=False)['feedback_text'].agg(' '.join)
+    agg['feedback_concat'] = agg['feedback_concat'].fillna('')
+    agg = agg.reset_index()
 
 
     agg['heard_often_mean'] = agg['heard_often_mean'].fillna(0)
@@ -85,27 +139,53 @@ def parse_survey(file_like):
 
 
 def parse_whatsapp_text_file_bytes(content_bytes):
-    text = content_bytes.decode('utf-8', errors='ignore')
-    lines = [L.strip() for L in text.splitlines() if L.strip()]
+    # A message is a line containing both '-' and ':'; the sender follows the
+    # first '-' ("<timestamp> - <sender>: <body>"). Lines are split on bytes, so
+    # only \n, \r\n and \r end a line (not the Unicode separators that
+    # str.splitlines() also breaks on).
     total_msgs = 0
     senders = set()
     event_mentions = 0
-    sender_pattern = re.compile(r'-\s*(.+?):')
-    for L in lines:
-        if '-' in L and ':' in L:
-            total_msgs += 1
-            m = sender_pattern.search(L)
+    for L in content_bytes.splitlines():
+        i = L.find(b'-')
+        if i == -1 or b':' not in L:
+            continue
+        # Fast path for the usual "- Name:" shape, where SENDER_RE would stop at
+        # the first ':' after the name; anything else goes through the regex
+        if L[i + 1:i + 2] == b' ' and L[i + 2:i + 3] not in b' \t\n\r\x0b\x0c:':
+            j = L.find(b':', i + 3)
+            if j != -1:
+                senders.add(L[i + 2:j].strip())
+                body = L[j + 1:]
+            else:
+                body = L
+        else:
+            m = SENDER_RE.match(L, i)
             if m:
-                sender = m.group(1).strip()
-                senders.add(sender)
-            low = L.lower()
-            if any(k in low for k in EVENT_KEYWORDS):
-                event_mentions += 1
+                senders.add(m.group(1).strip())
+                body = L[m.end():]
+            else:
+                body = L
+        total_msgs += 1
+        if EVENT_RE.search(body.lower()):
+            event_mentions += 1
     return {'total_msgs': total_msgs, 'unique_senders': len(senders), 'event_mentions': event_mentions}
 
 
-def parse_whatsapp_folder(uploaded_files):
-    rows = []
+def parse_whatsapp_text_file_bytes_named(payload):
+    club_name, content_bytes = payload
+    try:
+        res = parse_whatsapp_text_file_bytes(content_bytes)
+    except Exception as e:
+        res = {'total_msgs':0,'unique_senders':0,'event_mentions':0}
+    return {'club_name': club_name,
+            'whatsapp_msgs': res['total_msgs'],
+            'whatsapp_unique_senders': res['unique_senders'],
+            'whatsapp_event_mentions': res['event_mentions']}
+
+
+def iter_whatsapp_payloads(uploaded_files):
+    # Yields (club_name, bytes) for each upload
     for f in uploaded_files:
         fname = getattr(f, "name", None) or os.path.basename(f)
         club_name = normalize_name(os.path.splitext(fname)[0])
@@ -119,14 +199,52 @@ def parse_whatsapp_folder(uploaded_files):
             else:
                 with open(f, 'rb') as fh:
                     content_bytes = fh.read()
-            res = parse_whatsapp_text_file_bytes(content_bytes)
         except Exception as e:
-            res = {'total_msgs':0,'unique_senders':0,'event_mentions':0}
-        rows.append({'club_name': club_name,
-                     'whatsapp_msgs': res['total_msgs'],
-                     'whatsapp_unique_senders': res['unique_senders'],
-                     'whatsapp_event_mentions': res['event_mentions']})
-    return pd.DataFrame(rows)
+            content_bytes = b''
+        yield club_name, content_bytes
+
+
+def whatsapp_pool_context():
+    # Only fork: under spawn/forkserver each worker re-imports __main__, which
+    # under Streamlit is app.py itself. macOS offers fork but it is unsafe there.
+    if sys.platform != 'darwin' and 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def parse_whatsapp_folder(uploaded_files):
+    # Uploads are read on the main process; uploaded file objects are not picklable.
+    # The pool is only used for large uploads on a multi-core machine with fork.
+    payloads = list(iter_whatsapp_payloads(uploaded_files))
+    total_bytes = sum(len(content) for _, content in payloads)
+    pool_context = whatsapp_pool_context()
+    n = len(uploaded_files)
+    names = np.empty(n, dtype=object)
+    msgs = np.zeros(n, dtype=np.int32)
+    senders = np.zeros(n, dtype=np.int32)
+    mentions = np.zeros(n, dtype=np.int32)
+
+    def fill(i, row):
+        names[i] = row['club_name']
+        msgs[i] = row['whatsapp_msgs']
+        senders[i] = row['whatsapp_unique_senders']
+        mentions[i] = row['whatsapp_event_mentions']
+
+    if total_bytes >= WHATSAPP_PARALLEL_MIN_BYTES and (os.cpu_count() or 1) > 1 and pool_context is not None:
+        # A few chunks per worker keeps pickling overhead down without leaving
+        # one worker with all the large files
+        chunksize = max(1, len(payloads) // (4 * os.cpu_count()))
+        with ProcessPoolExecutor(mp_context=pool_context) as ex:
+            rows = ex.map(parse_whatsapp_text_file_bytes_named, payloads, chunksize=chunksize)
+            for i, row in enumerate(rows):
+                fill(i, row)
+    else:
+        for i, payload in enumerate(payloads):
+            fill(i, parse_whatsapp_text_file_bytes_named(payload))
+    return pd.DataFrame({'club_name': names,
+                         'whatsapp_msgs': msgs,
+                         'whatsapp_unique_senders': senders,
+                         'whatsapp_event_mentions': mentions})
 
 
 
@@ -137,34 +255,23 @@ def parse_whatsapp_folder(uploaded_files):
 def parse_event_log(file_like):
     if isinstance(file_like, str) or hasattr(file_like, "read"):
         try:
-            df = pd.read_csv(file_like)
+            df = pd.read_csv(file_like, engine='pyarrow', dtype_backend='pyarrow')
         except Exception:
+            if hasattr(file_like, "seek"):
+                file_like.seek(0)
             df = pd.read_excel(file_like)
     else:
-        df = pd.read_csv(file_like)
+        df = pd.read_csv(file_like, engine='pyarrow', dtype_backend='pyarrow')
     df.columns = [c.strip() for c in df.columns]
 
 
-    df['club_name'] = df['club_name'].apply(normalize_name)
-    if 'club_name' not in df.columns:
-        for alt in ['Club Name','club','clubname']:
-            if alt in df.columns:
-                df = df.rename(columns={alt:'club_name'})
-                break
-    if 'event_title' not in df.columns:
-        for alt in ['Event Title','title','event']:
-            if alt in df.columns:
-                df = df.rename(columns={alt:'event_title'})
-                break
-    if 'event_description' not in df.columns:
-        for alt in ['Event Description','description','details']:
-            if alt in df.columns:
-                df = df.rename(columns={alt:'event_description'})
-                break
-
-
-    df['event_title'] = df.get('event_title','').fillna('')
-    df['event_description'] = df.get('event_description','').fillna('')
+    df = resolve_column_aliases(df, EVENT_LOG_COLUMN_ALIASES)
+    df['club_name'] = df['club_name'].astype('string').str.strip().str.lower()
+
+
+    # Cast before filling: an all-blank column is read as null[pyarrow], which can't hold ''
+    for col in ['event_title', 'event_description']:
+        df[col] = df.get(col, pd.Series('', index=df.index)).astype('string').fillna('')
 
 
     agg = df.groupby('club_name').agg(
@@ -187,17 +294,15 @@ def parse_event_log(file_like):
 
 
 def compute_sentiment_per_club(agg_survey_df):
-    sia = SentimentIntensityAnalyzer()
-    rows = []
-    for _, r in agg_survey_df.iterrows():
-        txt = r.get('feedback_concat', "") or ""
-        if not txt or str(txt).strip() == "":
-            score01 = 0.5
-        else:
-            comp = sia.polarity_scores(str(txt))['compound']
-            score01 = (comp + 1.0)/2.0
-        rows.append({'club_name': r['club_name'], 'sentiment_score': score01})
-    return pd.DataFrame(rows)
+    sia = get_sia()
+    feedback = agg_survey_df.get('feedback_concat', pd.Series('', index=agg_survey_df.index))
+    texts = feedback.fillna('').astype(str).to_numpy(dtype=object)
+    # Clubs without feedback stay neutral and skip VADER entirely
+    scores = np.full(len(texts), 0.5)
+    for i, t in enumerate(texts):
+        if t.strip():
+            scores[i] = (sia.polarity_scores(t)['compound'] + 1.0)/2.0
+    return pd.DataFrame({'club_name': agg_survey_df['club_name'].to_numpy(), 'sentiment_score': scores})
 
 
 
@@ -205,13 +310,14 @@ def compute_sentiment_per_club(agg_survey_df):
 # Auto-assign group using keywords
 
 
-def assign_club_to_category(club_name, text):
-    text = f"{club_name} {text}".lower()
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        if any(kw in text for kw in keywords):
-            return category
-    # fallback
-    return 'others'
+def assign_club_categories(club_names, texts):
+    # First matching category wins, in CATEGORY_KEYWORDS order; one regex scan per category
+    combined = club_names + ' ' + texts
+    groups = pd.Series('others', index=combined.index)
+    for category, pattern in CATEGORY_RES.items():
+        mask = combined.str.contains(pattern, na=False)
+        groups[mask & (groups == 'others')] = category
+    return groups
 
 
 
@@ -219,9 +325,17 @@ def assign_club_to_category(club_name, text):
 
 
 def compute_group_scores(survey_agg_df, whatsapp_df, sentiment_df, event_agg_df, default_weights=None):
-    df = pd.merge(survey_agg_df, sentiment_df, on='club_name', how='outer')
-    df = pd.merge(df, whatsapp_df, on='club_name', how='outer')
-    df = pd.merge(df, event_agg_df, on='club_name', how='outer')
+    # One outer join on club_name; verify_integrity fails fast on duplicate clubs.
+    # Keys share one categorical dtype so club names are factorized only once.
+    frames = (survey_agg_df, sentiment_df, whatsapp_df, event_agg_df)
+    all_clubs = pd.Index(sorted(set().union(*(frame['club_name'] for frame in frames))))
+    club_dtype = pd.CategoricalDtype(categories=all_clubs, ordered=False)
+    survey, sentiment, whatsapp, events = (
+        frame.astype({'club_name': club_dtype}).set_index('club_name', verify_integrity=True)
+        for frame in frames
+    )
+    df = survey.join([sentiment, whatsapp, events], how='outer').rename_axis('club_name').reset_index()
+    df['club_name'] = df['club_name'].astype(str)
 
 
     df['heard_often_mean'] = df['heard_often_mean'].fillna(0)
@@ -236,7 +350,7 @@ def compute_group_scores(survey_agg_df, whatsapp_df, sentiment_df, event_agg_df,
 
 
     # Assign named groups
-    df['group'] = df.apply(lambda r: assign_club_to_category(r['club_name'], r['text_for_grouping']), axis=1)
+    df['group'] = assign_club_categories(df['club_name'], df['text_for_grouping'])
 
 
     if default_weights is None:
@@ -244,73 +358,46 @@ def compute_group_scores(survey_agg_df, whatsapp_df, sentiment_df, event_agg_df,
 
 
     # STEP 1: Calculate group scores (within-group comparison) - UNCHANGED
-    final_rows = []
-    for group, gdf in df.groupby('group'):
-        g = gdf.copy()
-        g['heard_norm'] = g['heard_often_mean'] / 5.0
-        if g['participation_mean'].max() - g['participation_mean'].min() > 0:
-            g['participation_norm'] = (g['participation_mean'] - g['participation_mean'].min()) / (g['participation_mean'].max() - g['participation_mean'].min())
-        else:
-            g['participation_norm'] = 0.0
-        g['sentiment_norm'] = g['sentiment_score']
-        if g['whatsapp_msgs'].max() - g['whatsapp_msgs'].min() > 0:
-            g['whatsapp_msgs_norm'] = (g['whatsapp_msgs'] - g['whatsapp_msgs'].min()) / (g['whatsapp_msgs'].max() - g['whatsapp_msgs'].min())
-        else:
-            g['whatsapp_msgs_norm'] = 0.0
-        if g['event_count'].max() - g['event_count'].min() > 0:
-            g['event_count_n'] = (g['event_count'] - g['event_count'].min()) / (g['event_count'].max() - g['event_count'].min())
-        else:
-            g['event_count_n'] = 0.0
-
-
-        w = default_weights
-        g['group_score'] = (
-            w['heard'] * g['heard_norm'] +
-            w['participation'] * g['participation_norm'] +
-            w['sentiment'] * g['sentiment_norm'] +
-            w['whatsapp_msgs'] * g['whatsapp_msgs_norm'] +
-            w['event_count'] * g['event_count_n']
-        )
-        final_rows.append(g)
-
-
-    final = pd.concat(final_rows, ignore_index=True)
+    # Min-max normalize within each group in a single pass over all columns
+    w = default_weights
+    minmax_cols = ['participation_mean', 'whatsapp_msgs', 'event_count']
+    grouped = df.groupby('group')[minmax_cols]
+    gmin = grouped.transform('min')
+    gmax = grouped.transform('max')
+    denom = (gmax - gmin).where(lambda x: x > 0, 1.0)
+    norms = (df[minmax_cols] - gmin) / denom
+    df['heard_norm'] = df['heard_often_mean'] / 5.0
+    df['participation_norm'] = norms['participation_mean']
+    df['sentiment_norm'] = df['sentiment_score']
+    df['whatsapp_msgs_norm'] = norms['whatsapp_msgs']
+    df['event_count_n'] = norms['event_count']
+
+    norm_cols = ['heard_norm', 'participation_norm', 'sentiment_norm', 'whatsapp_msgs_norm', 'event_count_n']
+    weights = np.array([w['heard'], w['participation'], w['sentiment'], w['whatsapp_msgs'], w['event_count']])
+    df['group_score'] = df[norm_cols].to_numpy(dtype=float) @ weights
+    final = df
     
     # STEP 2: Calculate overall scores (global comparison) - IMPROVED
-    # Global normalization across ALL clubs for overall score
-    final['heard_norm_global'] = final['heard_often_mean'] / 5.0
-    
-    if final['participation_mean'].max() > 0:
-        final['participation_norm_global'] = final['participation_mean'] / final['participation_mean'].max()
-    else:
-        final['participation_norm_global'] = 0.0
-        
-    final['sentiment_norm_global'] = final['sentiment_score']
-    
-    if final['whatsapp_msgs'].max() > 0:
-        final['whatsapp_msgs_norm_global'] = final['whatsapp_msgs'] / final['whatsapp_msgs'].max()
-    else:
-        final['whatsapp_msgs_norm_global'] = 0.0
-        
-    if final['event_count'].max() > 0:
-        final['event_count_norm_global'] = final['event_count'] / final['event_count'].max()
-    else:
-        final['event_count_norm_global'] = 0.0
+    # Global normalization across ALL clubs for overall score, as one array op.
+    # Counts are scaled by their global max (0 when the max is 0); heard_often is on
+    # a fixed 1-5 scale and sentiment is already 0-1.
+    global_cols = ['heard_often_mean', 'participation_mean', 'sentiment_score', 'whatsapp_msgs', 'event_count']
+    values = final[global_cols].to_numpy(dtype=float)
+    scale = values.max(axis=0, initial=0.0)
+    scale[0] = 5.0
+    scale[2] = 1.0
+    norms_global = np.divide(values, scale, out=np.zeros_like(values), where=scale > 0)
+    final[['heard_norm_global', 'participation_norm_global', 'sentiment_norm_global',
+           'whatsapp_msgs_norm_global', 'event_count_norm_global']] = norms_global
 
     # Calculate overall score using global normalization
-    w = default_weights
-    final['overall_score'] = (
-        w['heard'] * final['heard_norm_global'] +
-        w['participation'] * final['participation_norm_global'] +
-        w['sentiment'] * final['sentiment_norm_global'] +
-        w['whatsapp_msgs'] * final['whatsapp_msgs_norm_global'] +
-        w['event_count'] * final['event_count_norm_global']
-    )
+    final['overall_score'] = norms_global @ weights
 
     final['overall_rank'] = final['overall_score'].rank(method='min', ascending=False).astype(int)
 
-    winners = final.loc[final.groupby('group')['group_score'].idxmax()][['group','club_name','group_score','overall_score']].reset_index(drop=True)
+    # Sorted within each group, so the first row per group is its winner
     final = final.sort_values(['group','group_score'], ascending=[True, False])
+    winners = final.drop_duplicates('group', keep='first')[['group','club_name','group_score','overall_score']].reset_index(drop=True)
 
     # RENAME COLUMNS TO MORE USER-FRIENDLY NAMES
     final = final.rename(columns={